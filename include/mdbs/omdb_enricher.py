@@ -3,32 +3,55 @@ omdb_enricher.py
 Module for enriching series metadata with ratings from the OMDb API.
 """
 import os
+import re
 import requests
+from typing import Optional
+from include.scrapers.base_scraper import HttpFetcher, logger
+from include.scrapers.title_index import TitleIndex, years_match
 
 class OMDbEnricher:
     """
     Enriches series metadata with ratings from the OMDb API.
+    When a TitleIndex is given, series already resolved to an IMDb ID are
+    fetched by `i=` (and the ID dropped if its year no longer matches), title
+    lookups fall back to the indexed title and aliases, and newly resolved IDs
+    are recorded in the index.
     """
     BASE_URL = "http://www.omdbapi.com/"
+    SOURCE = "imdb"
 
-    def __init__(self, api_key: str = None):
+    def __init__(self, api_key: str = None, index: Optional[TitleIndex] = None):
         self.api_key = api_key or os.getenv("OMDB_API_KEY")
         if not self.api_key:
             raise ValueError("OMDb API key must be set in OMDB_API_KEY environment variable or passed explicitly.")
+        self.index = index
+        self.fetcher = HttpFetcher()
 
-    def fetch_ratings(self, title: str, year: int = None):
-        params = {
-            "apikey": self.api_key,
-            "t": title,
-            "type": "series"
-        }
-        if year:
-            params["y"] = str(year)
-        response = requests.get(self.BASE_URL, params=params)
-        response.raise_for_status()
-        data = response.json()
-        if data.get("Response") != "True":
+    def fetch_ratings(self, title: str, year: int = None, tmdb_id: int = None):
+        if tmdb_id is None and self.index is not None:
+            tmdb_id = self.index.resolve(title, year)
+        imdb_id = self.index.get_source_id(tmdb_id, self.SOURCE) if self.index is not None else None
+        try:
+            data = self._query({"i": imdb_id}) if imdb_id else None
+            if data is not None and year and not years_match(year, self._premiere_year(data)):
+                # A stored ID learned through the year-tolerant fallback no longer fits
+                logger.warning(f"Stored IMDb ID {imdb_id} for {title} has year {data.get('Year')}, expected {year}; dropping it.")
+                self.index.clear_source_id(tmdb_id, self.SOURCE)
+                data = None
+            if data is None:
+                names = self.index.candidate_titles(title, tmdb_id) if self.index is not None else [title]
+                for name in names:
+                    data = self._search_by_title(name, year)
+                    if data is not None:
+                        break
+        except requests.exceptions.RequestException as e:
+            # Includes an open circuit: skip OMDb for this series and keep the run going
+            logger.error(f"Error fetching OMDb ratings for {title}: {e}")
             return None
+        if data is None:
+            return None
+        if self.index is not None and tmdb_id is not None:
+            self.index.set_source_id(tmdb_id, self.SOURCE, data.get("imdbID"))
         ratings = {
             "imdb_rating": data.get("imdbRating"),
             "imdb_count": data.get("imdbVotes"),
@@ -38,4 +61,33 @@ class OMDbEnricher:
         for r in data.get("Ratings", []):
             if r["Source"] == "Rotten Tomatoes":
                 ratings["tomatoes_rating"] = r["Value"]
-        return ratings 
\ No newline at end of file
+        return ratings
+
+    def _search_by_title(self, title: str, year: int = None) -> Optional[dict]:
+        """
+        Look up by exact title and year, falling back to a title-only lookup
+        accepted when its premiere year is within the index's year tolerance.
+        """
+        params = {"t": title}
+        if year:
+            params["y"] = str(year)
+        data = self._query(params)
+        if data is not None or not year:
+            return data
+        data = self._query({"t": title})
+        if data is None:
+            return None
+        if not years_match(year, self._premiere_year(data)):
+            return None
+        return data
+
+    @staticmethod
+    def _premiere_year(data: dict) -> Optional[int]:
+        match = re.match(r"\d{4}", data.get("Year", ""))
+        return int(match.group(0)) if match else None
+
+    def _query(self, params: dict) -> Optional[dict]:
+        data = self.fetcher.get_json(self.BASE_URL, params={"apikey": self.api_key, "type": "series", **params})
+        if data.get("Response") != "True":
+            return None
+        return data
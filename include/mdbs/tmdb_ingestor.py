@@ -1,5 +1,6 @@
 import os
-import requests
+from typing import Iterator, Optional
+from include.scrapers.base_scraper import HttpFetcher
 
 class TMDBIngestor:
     """
@@ -11,28 +12,46 @@ class TMDBIngestor:
         self.api_key = api_key or os.getenv("TMDB_API_KEY")
         if not self.api_key:
             raise ValueError("TMDB API key must be set in TMDB_API_KEY environment variable or passed explicitly.")
+        self.fetcher = HttpFetcher()
 
     def fetch_top_rated_series(self, page: int = 1, language: str = "en-US"):
+        data = self._fetch_top_rated_page(page, language)
+        return [self._parse_series(item) for item in data.get("results", [])]
+
+    def iter_top_rated_series(self, max_pages: Optional[int] = None, language: str = "en-US") -> Iterator[dict]:
+        """
+        Lazily yield top-rated series page by page, fetching the next page only
+        once the previous one has been consumed.
+        """
+        page = 1
+        while max_pages is None or page <= max_pages:
+            data = self._fetch_top_rated_page(page, language)
+            for item in data.get("results", []):
+                yield self._parse_series(item)
+            if page >= data.get("total_pages", page):
+                return
+            page += 1
+
+    def _fetch_top_rated_page(self, page: int, language: str) -> dict:
         url = f"{self.BASE_URL}/tv/top_rated"
         params = {
             "api_key": self.api_key,
             "language": language,
             "page": page
         }
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        series_list = []
-        for item in data.get("results", []):
-            series_list.append({
-                "title": item.get("name"),
-                "year": int(item.get("first_air_date", "0000")[:4]) if item.get("first_air_date") else None,
-                "genres": item.get("genre_ids", []),
-                "language": item.get("original_language"),
-                "overview": item.get("overview"),
-                "tmdb_id": item.get("id"),
-                "popularity": item.get("popularity"),
-                "vote_average": item.get("vote_average"),
-                "vote_count": item.get("vote_count"),
-            })
-        return series_list 
\ No newline at end of file
+        return self.fetcher.get_json(url, params=params)
+
+    @staticmethod
+    def _parse_series(item: dict) -> dict:
+        return {
+            "title": item.get("name"),
+            "original_title": item.get("original_name"),
+            "year": int(item.get("first_air_date", "0000")[:4]) if item.get("first_air_date") else None,
+            "genres": item.get("genre_ids", []),
+            "language": item.get("original_language"),
+            "overview": item.get("overview"),
+            "tmdb_id": item.get("id"),
+            "popularity": item.get("popularity"),
+            "vote_average": item.get("vote_average"),
+            "vote_count": item.get("vote_count"),
+        }
@@ -0,0 +1,196 @@
+"""
+pipeline.py
+In-process streaming ETL: TMDB -> OMDb -> scrapers -> validation -> PostgreSQL.
+
+Each stage is a generator over series dicts. Stages are decoupled by bounded
+queues running in their own threads, so a series is scraped while the next one
+is still being enriched, and memory stays proportional to the buffer size
+rather than the catalog size.
+"""
+import os
+import queue
+import threading
+from contextlib import closing
+from typing import Callable, Iterable, Iterator, Optional
+
+import psycopg2
+
+from include.mdbs.tmdb_ingestor import TMDBIngestor
+from include.mdbs.omdb_enricher import OMDbEnricher
+from include.scrapers.base_scraper import logger
+from include.scrapers.metacritic_scraper import MetacriticScraper
+from include.scrapers.tomatos_scraper import RottenTomatoesScraper
+from include.scrapers.ratings_models import validate_series_ratings
+from include.scrapers.title_index import TitleIndex
+
+DEFAULT_BUFFER_SIZE = 16
+DEFAULT_COMMIT_EVERY = 50
+
+_END = object()
+
+
+def ingest_tmdb(ingestor: TMDBIngestor, max_pages: Optional[int] = None, index: Optional[TitleIndex] = None) -> Iterator[dict]:
+    for s in ingestor.iter_top_rated_series(max_pages=max_pages):
+        if index is not None:
+            index.add(s.get('tmdb_id'), s.get('title'), s.get('year'), aliases=[s.get('original_title')])
+        yield s
+
+
+def enrich_omdb(series_iter: Iterable[dict], enricher: OMDbEnricher) -> Iterator[dict]:
+    for s in series_iter:
+        s['omdb_ratings'] = enricher.fetch_ratings(s['title'], s.get('year'), tmdb_id=s.get('tmdb_id'))
+        yield s
+
+
+def enrich_scrapers(series_iter: Iterable[dict], metacritic, rt_scraper) -> Iterator[dict]:
+    for s in series_iter:
+        title = s.get('title')
+        year = s.get('year')
+        tmdb_id = s.get('tmdb_id')
+        s['metacritic_ratings'] = metacritic.get_ratings(title, year, tmdb_id=tmdb_id)
+        s['rotten_tomatoes_ratings'] = rt_scraper.get_ratings(title, year, tmdb_id=tmdb_id)
+        yield s
+
+
+def clean_and_validate(series_iter: Iterable[dict]) -> Iterator[dict]:
+    for s in series_iter:
+        yield validate_series_ratings(s)
+
+
+def buffered(source: Iterable[dict], maxsize: int = DEFAULT_BUFFER_SIZE, name: str = "stage") -> Iterator[dict]:
+    """
+    Drain `source` in a background thread into a bounded queue and yield from it.
+    The producer blocks once `maxsize` items are pending, which gives backpressure
+    between stages. Exceptions raised by the producer are re-raised in the consumer.
+    """
+    q: queue.Queue = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+    error: list = []
+
+    def _put(item) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce():
+        try:
+            for item in source:
+                if not _put(item):
+                    return
+        except BaseException as e:
+            error.append(e)
+        finally:
+            close = getattr(source, "close", None)
+            if close:
+                close()
+            _put(_END)
+
+    worker = threading.Thread(target=_produce, name=f"pipeline-{name}", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = q.get()
+            if item is _END:
+                break
+            yield item
+        if error:
+            raise error[0]
+    finally:
+        stop.set()
+        worker.join(timeout=1)
+
+
+class PostgresSink:
+    """
+    Writes validated series records to PostgreSQL (series and ratings tables),
+    committing every `commit_every` records.
+    """
+    def __init__(self, commit_every: int = DEFAULT_COMMIT_EVERY, conn=None):
+        self.commit_every = commit_every
+        self.conn = conn or psycopg2.connect(
+            dbname=os.getenv('PGDATABASE', 'seriesdb'),
+            user=os.getenv('PGUSER', 'postgres'),
+            password=os.getenv('PGPASSWORD', 'postgres'),
+            host=os.getenv('PGHOST', 'localhost'),
+            port=os.getenv('PGPORT', '5432'),
+        )
+        self.cur = self.conn.cursor()
+        self.loaded = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.conn.commit()
+        else:
+            self.conn.rollback()
+        self.close()
+
+    def write(self, s: dict) -> None:
+        # Simplified, no SCD2 logic
+        self.cur.execute('''
+            INSERT INTO series (tmdb_id, title, release_year, genres, language, plot)
+            VALUES (%s, %s, %s, %s, %s, %s)
+            ON CONFLICT (tmdb_id) DO NOTHING
+        ''', (
+            s.get('tmdb_id'),
+            s.get('title'),
+            s.get('year'),
+            str(s.get('genres')),
+            s.get('language'),
+            s.get('overview'),
+        ))
+        self.cur.execute('''
+            INSERT INTO ratings (series_id, imdb_rating, imdb_count, tomatoes_critic, metacritic, metauser, metauser_count, start_date, end_date, is_current)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, CURRENT_DATE, NULL, TRUE)
+            ON CONFLICT (series_id) DO NOTHING
+        ''', (
+            s.get('tmdb_id'),
+            (s.get('omdb_ratings') or {}).get('imdb_rating'),
+            (s.get('omdb_ratings') or {}).get('imdb_count'),
+            (s.get('rotten_tomatoes_ratings') or {}).get('critic_score'),
+            (s.get('metacritic_ratings') or {}).get('critic_score'),
+            (s.get('metacritic_ratings') or {}).get('user_score'),
+            (s.get('metacritic_ratings') or {}).get('user_count'),
+        ))
+        self.loaded += 1
+        if self.loaded % self.commit_every == 0:
+            self.conn.commit()
+
+    def close(self) -> None:
+        self.cur.close()
+        self.conn.close()
+
+
+def run_pipeline_streaming(
+    max_pages: Optional[int] = 1,
+    buffer_size: int = DEFAULT_BUFFER_SIZE,
+    sink_factory: Callable[[], PostgresSink] = PostgresSink,
+) -> int:
+    """
+    Run the full ETL as a chain of bounded streaming stages and return the
+    number of series loaded. `max_pages=None` walks every TMDB page.
+    Source IDs resolved along the way are persisted in the title index.
+    """
+    index = TitleIndex.load()
+    tmdb = TMDBIngestor()
+    omdb = OMDbEnricher(index=index)
+    metacritic = MetacriticScraper(index=index)
+    try:
+        with RottenTomatoesScraper(index=index) as rt_scraper, sink_factory() as sink:
+            stream = buffered(ingest_tmdb(tmdb, max_pages, index), buffer_size, name="tmdb")
+            stream = buffered(enrich_omdb(stream, omdb), buffer_size, name="omdb")
+            stream = buffered(enrich_scrapers(stream, metacritic, rt_scraper), buffer_size, name="scrapers")
+            # Stop the producer threads before the browser and connection are torn down
+            with closing(stream):
+                for s in clean_and_validate(stream):
+                    sink.write(s)
+            logger.info(f"Streaming pipeline loaded {sink.loaded} series")
+            return sink.loaded
+    finally:
+        index.save()
@@ -1,9 +1,15 @@
 # base_scraper.py
 import os
+import json
+import socket
 import urllib.robotparser
 from urllib.parse import urljoin, urlparse
 from abc import ABC, abstractmethod
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.request import ACCEPT_ENCODING
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -12,10 +18,12 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
 import logging
-from typing import Optional
+from typing import Any, Dict, Optional
 import re
+import threading
 import unicodedata
 from dotenv import load_dotenv
+from .title_index import TitleIndex
 
 load_dotenv()
 
@@ -25,27 +33,284 @@ logging.basicConfig(
 )
 logger = logging.getLogger("scraper")
 
+class FetchError(requests.exceptions.RequestException):
+    """Raised by HttpFetcher when a request is refused or aborted by a guard."""
+
+class ResponseTooLarge(FetchError):
+    pass
+
+class DeadlineExceeded(FetchError):
+    pass
+
+class CircuitOpenError(FetchError):
+    pass
+
+class CircuitBreaker:
+    """
+    Stops calls to a source after `failure_threshold` consecutive failures.
+    After `reset_timeout` seconds the circuit goes half-open and admits exactly
+    one trial call; other callers are refused until that call reports back.
+    A failed trial re-opens the circuit, a successful one closes it.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 300.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.state = self.CLOSED
+        self.opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.state = self.CLOSED
+            self.opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                logger.warning(f"Circuit opened for {self.name} after {self.failures} consecutive failures.")
+
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+_circuit_breakers_lock = threading.Lock()
+
+def get_circuit_breaker(host: str) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for a host."""
+    with _circuit_breakers_lock:
+        if host not in _circuit_breakers:
+            _circuit_breakers[host] = CircuitBreaker(host)
+        return _circuit_breakers[host]
+
+class _Deadline:
+    """
+    Watchdog for one request. When it fires it shuts down the request's socket,
+    which unblocks any pending connect/header/body read on it.
+    """
+    _current = threading.local()
+
+    def __init__(self, seconds: float):
+        self.expired = threading.Event()
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+        self._timer = threading.Timer(seconds, self._expire)
+        self._timer.daemon = True
+
+    def __enter__(self):
+        _Deadline._current.deadline = self
+        self._timer.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._timer.cancel()
+        _Deadline._current.deadline = None
+
+    @classmethod
+    def attach_current(cls, sock) -> None:
+        deadline = getattr(cls._current, "deadline", None)
+        if deadline is not None and sock is not None:
+            deadline.attach(sock)
+
+    def attach(self, sock: socket.socket) -> None:
+        with self._lock:
+            self._sock = sock
+            if self.expired.is_set():
+                self._shutdown()
+
+    def _expire(self) -> None:
+        with self._lock:
+            self.expired.set()
+            self._shutdown()
+
+    def _shutdown(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+class _DeadlineConnectionMixin:
+    """Reports the connection's socket to the calling thread's _Deadline."""
+    def connect(self):
+        super().connect()
+        _Deadline.attach_current(self.sock)
+
+    def request(self, *args, **kwargs):
+        # Reused keep-alive connections are already connected
+        _Deadline.attach_current(self.sock)
+        return super().request(*args, **kwargs)
+
+class _DeadlineHTTPConnection(_DeadlineConnectionMixin, HTTPConnection):
+    pass
+
+class _DeadlineHTTPSConnection(_DeadlineConnectionMixin, HTTPSConnection):
+    pass
+
+class _DeadlineHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _DeadlineHTTPConnection
+
+class _DeadlineHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _DeadlineHTTPSConnection
+
+class _DeadlineAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _DeadlineHTTPConnectionPool,
+            "https": _DeadlineHTTPSConnectionPool,
+        }
+
+class HttpFetcher:
+    """
+    Guarded HTTP GET shared by all sources (scrapers, OMDb, TMDB).
+    Applies connect/read timeouts, a per-request deadline covering connect,
+    headers and body, streamed reads capped at `max_bytes` of decoded content
+    (gzip/deflate, and br when brotli is installed) and a per-host circuit breaker.
+    Only connection errors, timeouts, 429 and 5xx responses count as failures.
+    """
+    CONNECT_TIMEOUT_SECONDS = 5.0
+    READ_TIMEOUT_SECONDS = 15.0
+    DEADLINE_SECONDS = 30.0
+    MAX_BYTES = 5 * 1024 * 1024
+    CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        user_agent: str = "",
+        connect_timeout: float = CONNECT_TIMEOUT_SECONDS,
+        read_timeout: float = READ_TIMEOUT_SECONDS,
+        deadline: float = DEADLINE_SECONDS,
+        max_bytes: int = MAX_BYTES,
+    ):
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.deadline = deadline
+        self.max_bytes = max_bytes
+        self.session = requests.Session()
+        self.session.mount("http://", _DeadlineAdapter())
+        self.session.mount("https://", _DeadlineAdapter())
+        self.session.headers.update({"Accept-Encoding": ACCEPT_ENCODING})
+        if user_agent:
+            self.session.headers.update({"User-Agent": user_agent})
+
+    def get_text(self, url: str, params: Optional[dict] = None) -> str:
+        response, body = self._get(url, params)
+        return body.decode(response.encoding or "utf-8", errors="replace")
+
+    def get_json(self, url: str, params: Optional[dict] = None) -> Any:
+        _, body = self._get(url, params)
+        try:
+            return json.loads(body)
+        except ValueError as e:
+            raise requests.exceptions.InvalidJSONError(f"{url} returned invalid JSON: {e}") from e
+
+    def _get(self, url: str, params: Optional[dict] = None):
+        host = urlparse(url).netloc
+        breaker = get_circuit_breaker(host)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {host}, skipping {url}")
+        timeout = (min(self.connect_timeout, self.deadline), min(self.read_timeout, self.deadline))
+        failed = False
+        try:
+            with _Deadline(self.deadline) as deadline:
+                try:
+                    with self.session.get(url, params=params, stream=True, timeout=timeout) as response:
+                        response.raise_for_status()
+                        declared = response.headers.get("Content-Length")
+                        if declared and declared.isdigit() and int(declared) > self.max_bytes:
+                            raise ResponseTooLarge(f"{url} declares {declared} bytes, cap is {self.max_bytes}")
+                        body = self._read_body(url, response, deadline)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                    if deadline.expired.is_set():
+                        raise DeadlineExceeded(f"{url} exceeded {self.deadline}s deadline") from e
+                    raise
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code if e.response is not None else 0
+            failed = status == 429 or status >= 500
+            raise
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout, requests.exceptions.ChunkedEncodingError, DeadlineExceeded):
+            failed = True
+            raise
+        finally:
+            # Any other outcome (404, oversized body) means the source is up
+            if failed:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+        return response, body
+
+    def _read_body(self, url: str, response: requests.Response, deadline: _Deadline) -> bytes:
+        """
+        Read the body in chunks, enforcing `max_bytes` on decoded content. The
+        deadline watchdog shuts the socket down when the budget runs out, so a
+        slow drip of bytes cannot keep a chunk read blocked past it.
+        """
+        body = bytearray()
+        for chunk in response.iter_content(self.CHUNK_SIZE):
+            if deadline.expired.is_set():
+                break
+            body.extend(chunk)
+            if len(body) > self.max_bytes:
+                raise ResponseTooLarge(f"{url} exceeded {self.max_bytes} bytes")
+        if deadline.expired.is_set():
+            raise DeadlineExceeded(f"{url} exceeded {self.deadline}s deadline")
+        return bytes(body)
+
 class BaseScraper(ABC):
     """
     Abstract base class for all scrapers.
     Handles robots.txt and user agent logic.
     """
+    SOURCE = ""
     DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
-    def __init__(self, base_url: str, robots_txt_path: str = "robots.txt", user_agent: str = ""):
+    def __init__(self, base_url: str, robots_txt_path: str = "robots.txt", user_agent: str = "", index: Optional[TitleIndex] = None):
+        self.index = index
         if not base_url.endswith('/'):
             base_url += '/'
         self.base_url = base_url
         self.robots_txt_url = urljoin(self.base_url, robots_txt_path or "robots.txt")
         self.user_agent = user_agent or self.DEFAULT_USER_AGENT
+        self.fetcher = HttpFetcher(user_agent=self.user_agent)
         self.robot_parser = urllib.robotparser.RobotFileParser()
+        self._connect()
+
+    def _connect(self) -> None:
+        """
+        Network setup run at the end of __init__. Subclasses extend it (e.g. to
+        start a browser); replay scrapers override it to stay offline.
+        """
         self._load_robots_txt()
 
     def _load_robots_txt(self) -> None:
+        self.robot_parser.set_url(self.robots_txt_url)
         try:
-            self.robot_parser.set_url(self.robots_txt_url)
-            self.robot_parser.read()
+            self.robot_parser.parse(self.fetcher.get_text(self.robots_txt_url).splitlines())
             logger.info(f"Successfully loaded robots.txt from {self.robots_txt_url}")
+        except requests.exceptions.HTTPError as e:
+            # Same semantics as RobotFileParser.read(): 401/403 disallow everything, other 4xx allow everything
+            status = e.response.status_code if e.response is not None else None
+            if status in (401, 403):
+                self.robot_parser.disallow_all = True
+            elif status is not None and 400 <= status < 500:
+                self.robot_parser.allow_all = True
+            logger.warning(f"robots.txt at {self.robots_txt_url} returned {status}.")
         except Exception as e:
             logger.warning(f"Error loading robots.txt from {self.robots_txt_url}: {e}. Proceeding without robots.txt rules enforced (not recommended).")
 
@@ -63,10 +328,40 @@ class BaseScraper(ABC):
         title = re.sub(rf"{re.escape(sep)}{{2,}}", sep, title)
         return title.strip(sep)
 
+    def _get_ratings_by_slug(self, series_title: str, year: int, sep: str, tmdb_id: Optional[int] = None) -> Optional[dict]:
+        """
+        Try the slug remembered in the title index first, then the title slug and
+        the -{year} suffixed slug, then the same for each indexed title and alias.
+        The slug that validates is recorded in the index.
+        """
+        if tmdb_id is None and self.index is not None:
+            tmdb_id = self.index.resolve(series_title, year)
+        known_slug = self.index.get_source_id(tmdb_id, self.SOURCE) if self.index is not None else None
+        names = self.index.candidate_titles(series_title, tmdb_id) if self.index is not None else [series_title]
+        candidates = [known_slug] if known_slug else []
+        for name in names:
+            formatted_title = BaseScraper._preprocess_title(name, sep=sep)
+            for slug in (formatted_title, f"{formatted_title}{sep}{year}"):
+                if formatted_title and slug not in candidates:
+                    candidates.append(slug)
+        for attempt, slug in enumerate(candidates):
+            if attempt:
+                logger.info(f"Retrying with title: {slug}")
+            result = self._fetch_and_validate(slug, year)
+            if result:
+                if self.index is not None and tmdb_id is not None:
+                    self.index.set_source_id(tmdb_id, self.SOURCE, slug)
+                return result
+        return None
+
     @abstractmethod
     def _fetch_page(self, url: str) -> Optional[str]:
         pass
 
+    @abstractmethod
+    def _fetch_and_validate(self, formatted_title: str, year: int) -> Optional[dict]:
+        pass
+
     @abstractmethod
     def _parse_content(self, html_content: str):
         pass
@@ -81,18 +376,16 @@ class HtmlScraper(BaseScraper):
     """
     REQUEST_DELAY_SECONDS = 1
 
-    def __init__(self, base_url: str, robots_txt_path: str = "robots.txt", user_agent: str = ""):
-        super().__init__(base_url, robots_txt_path, user_agent)
-        self.session = requests.Session()
-        self.session.headers.update({"User-Agent": self.user_agent})
+    def __init__(self, base_url: str, robots_txt_path: str = "robots.txt", user_agent: str = "", index: Optional[TitleIndex] = None):
+        super().__init__(base_url, robots_txt_path, user_agent, index=index)
+        self.session = self.fetcher.session
 
     def _fetch_page(self, url: str) -> Optional[str]:
         try:
             logger.info(f"Fetching: {url}")
-            response = self.session.get(url)
-            response.raise_for_status()
+            html_content = self.fetcher.get_text(url)
             time.sleep(self.REQUEST_DELAY_SECONDS)
-            return response.text
+            return html_content
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching {url}: {e}")
             return None
@@ -100,10 +393,17 @@ class HtmlScraper(BaseScraper):
 
 
 class SeleniumScraper(BaseScraper):
-    def __init__(self, base_url: str, user_agent: str = '', driver_path: str = '', profile_path: str = ''):
-        super().__init__(base_url, user_agent=user_agent)
+    PAGE_LOAD_TIMEOUT_SECONDS = 30
+
+    def __init__(self, base_url: str, user_agent: str = '', driver_path: str = '', profile_path: str = '', index: Optional[TitleIndex] = None):
         self.driver_path = driver_path or os.getenv("CHROME_DRIVER") or r"C:/Users/hamed/OneDrive/Desktop/Projects/TopSeries/chromedriver.exe"
         self.profile_path = profile_path or os.getenv("SELENIUM_PROFILE_DIR") or ""
+        self.driver = None
+        self.circuit_breaker = get_circuit_breaker(urlparse(base_url).netloc)
+        super().__init__(base_url, user_agent=user_agent, index=index)
+
+    def _connect(self) -> None:
+        super()._connect()
         if not self.driver_path or not os.path.exists(self.driver_path):
             raise FileNotFoundError(f"ChromeDriver not found at {self.driver_path}. Set CHROME_DRIVER in your .env file or pass driver_path explicitly.")
         chrome_options = Options()
@@ -125,13 +425,23 @@ class SeleniumScraper(BaseScraper):
         logger.info(f"[Selenium] Starting Chrome with driver at: {self.driver_path}")
         service = Service(self.driver_path, log_path="NUL")
         self.driver = webdriver.Chrome(service=service, options=chrome_options)
+        self.driver.set_page_load_timeout(self.PAGE_LOAD_TIMEOUT_SECONDS)
     def __enter__(self):
         return self
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.quit()
     def _fetch_page(self, url: str) -> str | None:
+        if not self.circuit_breaker.allow():
+            logger.error(f"Circuit open for {self.circuit_breaker.name}, skipping {url}")
+            return None
         try:
             self.driver.get(url)
+        except Exception as e:
+            self.circuit_breaker.record_failure()
+            logger.error(f"Error fetching {url} with Selenium: {e}")
+            return None
+        self.circuit_breaker.record_success()
+        try:
             wait = WebDriverWait(self.driver, 8)
             wait.until(EC.presence_of_element_located((By.TAG_NAME, "media-scorecard")))
             return self.driver.page_source
@@ -139,4 +449,5 @@ class SeleniumScraper(BaseScraper):
             logger.error(f"Error fetching {url} with Selenium: {e}")
             return None
     def quit(self):
-        self.driver.quit()
\ No newline at end of file
+        if self.driver is not None:
+            self.driver.quit()
\ No newline at end of file
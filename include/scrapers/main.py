@@ -1,39 +1,301 @@
 # main.py
-from scrapers.metacritic_scraper import MetacriticScraper
-from scrapers.tomatos_scraper import RottenTomatoesScraper
-from scrapers.base_scraper import logger
-from typing import List, Tuple, Optional, Dict
+"""
+Command-line runner for the scrapers outside Airflow.
 
-def print_ratings(source: str, scraper, series_list: List[Tuple[str, int]]):
+    python -m include.scrapers.main --input series.csv --source metacritic --concurrency 4
+    python -m include.scrapers.main --input series.csv --record-dir pages/
+    python -m include.scrapers.main --input series.csv --title-index title_index.json
+    python -m include.scrapers.main --input series.csv --replay-dir pages/ --profile --report-dir reports/
+    python -m include.scrapers.main --stream
+
+The input file holds one `title,year` pair per line (CSV, optional header).
+"""
+import argparse
+import cProfile
+import csv
+import os
+import pstats
+import queue
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from include.scrapers.metacritic_scraper import MetacriticScraper
+from include.scrapers.tomatos_scraper import RottenTomatoesScraper
+from include.scrapers.base_scraper import logger
+from include.scrapers.ratings_models import validate_series_ratings
+from include.scrapers.title_index import TitleIndex
+from typing import Callable, List, Tuple, Optional, Dict
+
+SCRAPERS = {
+    MetacriticScraper.SOURCE: MetacriticScraper,
+    RottenTomatoesScraper.SOURCE: RottenTomatoesScraper,
+}
+
+DEFAULT_SERIES = [
+    ("Game of Thrones", 2011),
+    ("The Last of Us", 2023),
+    ("The Boys", 2019),
+    ("Series That Does Not Exist", 2024),
+    ("Stranger Things Season 5", 2025) # doesn't exist
+]
+
+def load_series(path: str) -> List[Tuple[str, int]]:
+    """
+    Read (title, year) pairs from a CSV file. The year is the last column, so
+    unquoted titles containing commas still parse. A header row is skipped.
+    """
+    series_list = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for line_no, row in enumerate(csv.reader(f), start=1):
+            if not row or not "".join(row).strip() or row[0].lstrip().startswith("#"):
+                continue
+            title = ",".join(row[:-1]).strip()
+            try:
+                year = int(row[-1])
+            except ValueError:
+                if line_no != 1:
+                    logger.warning(f"Skipping line {line_no} of {path}: year {row[-1]!r} is not an integer.")
+                continue
+            if title:
+                series_list.append((title, year))
+    return series_list
+
+class SavedPages:
+    """
+    Pages stored on disk as <directory>/<source>/<url path>.html, used to record
+    live fetches and to replay them without network access.
+    """
+    def __init__(self, directory: str, source: str):
+        self.directory = os.path.join(directory, source)
+
+    def path_for(self, url: str) -> str:
+        name = urlparse(url).path.strip("/").replace("/", "__") or "index"
+        return os.path.join(self.directory, f"{name}.html")
+
+    def load(self, url: str) -> Optional[str]:
+        path = self.path_for(url)
+        if not os.path.exists(path):
+            logger.warning(f"No saved page for {url} at {path}")
+            return None
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def save(self, url: str, html_content: str) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path_for(url), "w", encoding="utf-8") as f:
+            f.write(html_content)
+
+def replaying(scraper_cls, pages: SavedPages):
+    """
+    Subclass `scraper_cls` to serve pages from disk. The scraper is fully
+    constructed, but its network setup (robots.txt, browser) is skipped, so only
+    the parse/validate path is exercised.
+    """
+    class ReplayScraper(scraper_cls):
+        def _connect(self) -> None:
+            self.robot_parser.allow_all = True
+
+        def _fetch_page(self, url: str) -> Optional[str]:
+            return pages.load(url)
+
+    return ReplayScraper
+
+def recording(scraper_cls, pages: SavedPages):
+    """Subclass `scraper_cls` to save every page it fetches."""
+    class RecordingScraper(scraper_cls):
+        def _fetch_page(self, url: str) -> Optional[str]:
+            html_content = super()._fetch_page(url)
+            if html_content:
+                pages.save(url, html_content)
+            return html_content
+
+    return RecordingScraper
+
+def quit_scrapers(scrapers: list) -> None:
+    for scraper in scrapers:
+        if hasattr(scraper, "quit"):
+            scraper.quit()
+
+def build_scrapers(source: str, count: int, replay_dir: str = "", record_dir: str = "", index: Optional[TitleIndex] = None) -> list:
     """
-    Generic function to print ratings for a list of series using a given scraper.
+    Construct `count` scrapers for `source`. If one fails to start, those
+    already started (and their browsers) are quit before the error propagates.
+    """
+    scraper_cls = SCRAPERS[source]
+    if replay_dir:
+        scraper_cls = replaying(scraper_cls, SavedPages(replay_dir, source))
+    elif record_dir:
+        scraper_cls = recording(scraper_cls, SavedPages(record_dir, source))
+    scrapers = []
+    try:
+        for _ in range(count):
+            scrapers.append(scraper_cls(index=index))
+    except BaseException:
+        quit_scrapers(scrapers)
+        raise
+    return scrapers
+
+def scrape_series(source: str, scraper, title: str, year: int) -> Optional[Dict]:
+    """
+    Fetch, parse and validate ratings for one series from one source.
+    """
+    logger.info(f"Scraping {source} for: {title} ({year})")
+    ratings: Optional[Dict] = scraper.get_ratings(title, year)
+    if not ratings:
+        logger.warning(f"Failed to get {source} ratings for {title}.")
+        return None
+    key = f"{source}_ratings"
+    return validate_series_ratings({"title": title, "year": year, key: ratings})[key]
+
+def print_ratings(source: str, title: str, ratings: Optional[Dict]):
+    if not ratings:
+        return
+    logger.info(f"{source} Ratings for {title}:")
+    for key, value in ratings.items():
+        logger.info(f"  {key.replace('_', ' ').title()}: {value}")
+
+def run_source(source: str, series_list: List[Tuple[str, int]], concurrency: int = 1, replay_dir: str = "", record_dir: str = "", index: Optional[TitleIndex] = None) -> List[Optional[Dict]]:
+    """
+    Scrape every series from one source with `concurrency` workers, each
+    owning its own scraper instance (and browser, for Selenium scrapers).
     """
     logger.info(f"--- {source} Scraping ---")
-    for title, year in series_list:
-        logger.info(f"Scraping {source} for: {title} ({year})")
-        ratings: Optional[Dict] = scraper.get_ratings(title, year)
-        if ratings:
-            logger.info(f"{source} Ratings for {title}:")
-            for key, value in ratings.items():
-                logger.info(f"  {key.replace('_', ' ').title()}: {value}")
+    scrapers = build_scrapers(source, concurrency, replay_dir, record_dir, index)
+    pool: queue.Queue = queue.Queue()
+    for scraper in scrapers:
+        pool.put(scraper)
+
+    def _scrape(item: Tuple[str, int]) -> Optional[Dict]:
+        scraper = pool.get()
+        try:
+            return scrape_series(source, scraper, *item)
+        finally:
+            pool.put(scraper)
+
+    try:
+        if concurrency == 1:
+            results = [_scrape(item) for item in series_list]
         else:
-            logger.warning(f"Failed to get {source} ratings for {title}.")
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                results = list(executor.map(_scrape, series_list))
+    finally:
+        quit_scrapers(scrapers)
+    for (title, _), ratings in zip(series_list, results):
+        print_ratings(source, title, ratings)
+    return results
 
-def main():
+def run_profiled(fn: Callable[[], object], report_dir: str, top: int = 30, sort: str = "cumulative") -> None:
     """
-    Run both Metacritic and Rotten Tomatoes scrapers on a test list of series.
+    Run `fn` under cProfile and tracemalloc and write to `report_dir`:
+    hotspots.txt (pstats sorted by `sort`), allocations.txt (top allocation
+    sites by size) and profile.prof (raw stats, e.g. for snakeviz or flameprof).
     """
-    test_series = [
-        ("Game of Thrones", 2011),
-        ("The Last of Us", 2023),
-        ("The Boys", 2019),
-        ("Series That Does Not Exist", 2024),
-        ("Stranger Things Season 5", 2025) # doesn't exist
-    ]
-    print_ratings("Metacritic", MetacriticScraper(), test_series)
-    logger.info("="*50)
-    with RottenTomatoesScraper() as rt_scraper:
-        print_ratings("Rotten Tomatoes", rt_scraper, test_series)
+    if sort not in pstats.Stats.sort_arg_dict_default:
+        raise ValueError(f"Unknown pstats sort key {sort!r}")
+    os.makedirs(report_dir, exist_ok=True)
+    profiler = cProfile.Profile()
+    tracemalloc.start(25)
+    try:
+        profiler.runcall(fn)
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    prof_path = os.path.join(report_dir, "profile.prof")
+    profiler.dump_stats(prof_path)
+    hotspots_path = os.path.join(report_dir, "hotspots.txt")
+    with open(hotspots_path, "w", encoding="utf-8") as f:
+        stats = pstats.Stats(profiler, stream=f)
+        stats.strip_dirs().sort_stats(sort).print_stats(top)
+
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ))
+    allocations_path = os.path.join(report_dir, "allocations.txt")
+    with open(allocations_path, "w", encoding="utf-8") as f:
+        f.write(f"Peak traced memory: {peak / 1024:.1f} KiB\n")
+        f.write(f"Top {top} allocation sites by size:\n")
+        for stat in snapshot.statistics("lineno")[:top]:
+            f.write(f"{stat}\n")
+            for line in stat.traceback.format(limit=3):
+                f.write(f"    {line}\n")
+    logger.info(f"Profile reports written to {hotspots_path}, {allocations_path} and {prof_path}")
+
+def run_streaming():
+    """
+    Run the full TMDB -> OMDb -> scrapers -> validation -> PostgreSQL pipeline in streaming mode.
+    """
+    from include.pipeline import run_pipeline_streaming
+    loaded = run_pipeline_streaming()
+    logger.info(f"Streaming pipeline finished: {loaded} series loaded.")
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the ratings scrapers outside Airflow.")
+    parser.add_argument("--input", help="CSV file of title,year pairs (defaults to a built-in test list)")
+    parser.add_argument("--source", action="append", choices=sorted(SCRAPERS), help="Source to scrape; repeatable (default: all)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Worker threads (and scraper instances) per source")
+    parser.add_argument("--title-index", default="", help="Title index JSON (as written by the pipeline) used to resolve titles to known slugs and aliases")
+    parser.add_argument("--record-dir", default="", help="Save every fetched page under this directory")
+    parser.add_argument("--replay-dir", default="", help="Serve pages from this directory instead of fetching them")
+    parser.add_argument("--profile", action="store_true", help="Run under cProfile and tracemalloc and write reports")
+    parser.add_argument("--report-dir", default="profile_reports", help="Where --profile writes its reports")
+    parser.add_argument("--top", type=int, default=30, help="Entries per profile report")
+    parser.add_argument("--sort", default="cumulative", choices=sorted(pstats.Stats.sort_arg_dict_default), help="pstats sort key for the hotspot report")
+    parser.add_argument("--stream", action="store_true", help="Run the full streaming ETL pipeline instead")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.record_dir and args.replay_dir:
+        parser.error("--record-dir and --replay-dir are mutually exclusive")
+    if args.stream:
+        conflicting = [flag for flag, value in (
+            ("--input", args.input),
+            ("--source", args.source),
+            ("--concurrency", args.concurrency != 1),
+            ("--record-dir", args.record_dir),
+            ("--replay-dir", args.replay_dir),
+            ("--title-index", args.title_index),
+            ("--profile", args.profile),
+        ) if value]
+        if conflicting:
+            parser.error(f"--stream cannot be combined with {', '.join(conflicting)}")
+    return args
+
+def main(argv: Optional[List[str]] = None):
+    """
+    Run the selected scrapers on the input series, optionally under the profiler.
+    """
+    args = parse_args(argv)
+    if args.stream:
+        run_streaming()
+        return
+    series_list = load_series(args.input) if args.input else DEFAULT_SERIES
+    sources = args.source or list(SCRAPERS)
+    concurrency = args.concurrency
+    if args.profile and concurrency > 1:
+        # cProfile only sees the thread that enabled it
+        logger.warning("--profile runs with a single worker; ignoring --concurrency.")
+        concurrency = 1
+
+    index = TitleIndex.load(args.title_index) if args.title_index else None
+
+    def _run():
+        try:
+            for i, source in enumerate(sources):
+                if i:
+                    logger.info("="*50)
+                run_source(source, series_list, concurrency, args.replay_dir, args.record_dir, index)
+        finally:
+            if index is not None:
+                index.save()
+
+    if args.profile:
+        run_profiled(_run, args.report_dir, top=args.top, sort=args.sort)
+    else:
+        _run()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,32 +1,28 @@
 from bs4 import BeautifulSoup, Tag
 from urllib.parse import urljoin
-from .base_scraper import BaseScraper, HtmlScraper, logger
+from .base_scraper import HtmlScraper, logger
 import re
 from typing import Optional, Dict
 from .ratings_models import validate_ratings
+from .title_index import TitleIndex, years_match
 
 
 class MetacriticScraper(HtmlScraper):
     """
     Scraper for Metacritic TV series ratings.
     """
-    def __init__(self):
-        super().__init__(base_url="https://www.metacritic.com/")
+    BASE_URL = "https://www.metacritic.com/"
+    SOURCE = "metacritic"
 
-    def get_ratings(self, series_title: str, year: int) -> Optional[Dict[str, int | float | None]]:
+    def __init__(self, index: Optional[TitleIndex] = None):
+        super().__init__(base_url=self.BASE_URL, index=index)
+
+    def get_ratings(self, series_title: str, year: int, tmdb_id: Optional[int] = None) -> Optional[Dict[str, int | float | None]]:
         """
         Fetch and parse ratings for a given series and year. 
-        Retries with -{year} suffix if year mismatch.
+        Tries the slug known from the title index first, then retries with -{year} suffix if year mismatch.
         """
-        sep = '-'
-
-        formatted_title =  BaseScraper._preprocess_title(series_title, sep=sep)
-        result = self._fetch_and_validate(formatted_title, year)
-        if result:
-            return result
-        logger.info(f"Retrying with title: {formatted_title}{sep}{year}")
-        retry_title = f"{formatted_title}{sep}{year}"
-        return self._fetch_and_validate(retry_title, year)
+        return self._get_ratings_by_slug(series_title, year, sep='-', tmdb_id=tmdb_id)
 
 
     def _fetch_and_validate(self, formatted_title: str, year: int) -> Optional[Dict[str, int | float | None]]:
@@ -37,7 +33,7 @@ class MetacriticScraper(HtmlScraper):
         ratings = self._parse_content(html_content)
         scraped_year = ratings.get("year")
 
-        if scraped_year != year: # Integrity check
+        if not years_match(year, scraped_year): # Integrity check, tolerates off-by-one premiere years
             logger.warning(f"Year mismatch for {formatted_title}: expected {year}, found {scraped_year}.")
             return None
 
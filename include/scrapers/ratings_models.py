@@ -30,4 +30,20 @@ def validate_ratings(ratings: dict) -> dict:
         return validated.model_dump()
     except ValidationError as e:
         logger.error(f"Ratings validation error: {e}")
-        return ratings
\ No newline at end of file
+        return ratings
+
+RATING_SOURCES = ("omdb_ratings", "metacritic_ratings", "rotten_tomatoes_ratings")
+
+def validate_series_ratings(series: dict) -> dict:
+    """
+    Validate every per-source ratings dict attached to an enriched series record.
+    Sources that are missing or empty are left untouched.
+    """
+    for source in RATING_SOURCES:
+        if series.get(source):
+            series[source] = validate_ratings({
+                'title': series.get('title', ''),
+                'year': series.get('year', 0),
+                **series[source]
+            })
+    return series
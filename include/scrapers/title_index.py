@@ -0,0 +1,198 @@
+"""
+title_index.py
+Local fuzzy-matching index for cross-source series identity, keyed by tmdb_id.
+
+Each entry holds the normalized title, aliases, premiere year and any stable
+per-source identifiers learned so far (IMDb ID from OMDb, Metacritic and
+Rotten Tomatoes slugs), so later runs can fetch by ID instead of re-guessing
+from the title.
+
+Fuzzy matches are only candidates: resolve() treats a candidate as the same
+series only when its normalized title or an alias equals the normalized query.
+It maps untagged (title, year) queries, e.g. from the CLI, to a tmdb_id; once a
+tmdb_id is known, candidate_titles() supplies the indexed title and aliases as
+fallback lookups for sources that miss on the query title.
+
+The index is a local JSON file. It only persists between runs if every
+process that uses it sees the same TITLE_INDEX_PATH (e.g. a shared volume);
+with a relative default on ephemeral worker disks, learned IDs are lost.
+"""
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger("scraper")
+
+YEAR_TOLERANCE = 1
+# Padded-trigram Jaccard: "game of thrones" vs "game of thrones 2011" scores ~0.76,
+# while unrelated titles sharing one word stay well below 0.6. Near misses such as
+# "the crowd"/"the crown" still pass, which is why resolve() confirms candidates.
+DEFAULT_MATCH_THRESHOLD = 0.6
+
+
+def normalize_title(title: str) -> str:
+    """Lowercase, strip accents and punctuation, and collapse whitespace."""
+    title = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode("ascii")
+    title = title.lower().replace("&", " and ")
+    title = re.sub(r"[^a-z0-9]+", " ", title)
+    return title.strip()
+
+
+def trigrams(title: str) -> Set[str]:
+    padded = f"  {normalize_title(title)} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def years_match(expected: Optional[int], found: Optional[int], tolerance: int = YEAR_TOLERANCE) -> bool:
+    if expected is None or found is None:
+        return expected == found
+    return abs(expected - found) <= tolerance
+
+
+class TitleIndex:
+    """
+    In-memory trigram index over series titles and aliases, optionally persisted
+    to a JSON file (TITLE_INDEX_PATH). Safe to share between pipeline threads.
+    """
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("TITLE_INDEX_PATH", "title_index.json")
+        self.entries: Dict[str, dict] = {}
+        self._grams: Dict[str, Set[str]] = defaultdict(set)
+        self._lock = threading.RLock()
+
+    @classmethod
+    def load(cls, path: Optional[str] = None) -> "TitleIndex":
+        index = cls(path)
+        if os.path.exists(index.path):
+            try:
+                with open(index.path, encoding="utf-8") as f:
+                    for tmdb_id, entry in json.load(f).items():
+                        index._insert(tmdb_id, entry)
+                logger.info(f"Loaded {len(index.entries)} titles from {index.path}")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not load title index from {index.path}: {e}. Starting empty.")
+        return index
+
+    def save(self) -> None:
+        with self._lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+
+    def add(self, tmdb_id, title: str, year: Optional[int], aliases: Iterable[str] = ()) -> None:
+        """
+        Add or refresh a series. Title, year and aliases are replaced; source IDs
+        already learned for it are kept.
+        """
+        if tmdb_id is None or not title:
+            return
+        key = str(tmdb_id)
+        with self._lock:
+            existing = self.entries.get(key, {})
+            names = {a for a in aliases if a and a != title}
+            self._insert(key, {
+                "title": title,
+                "year": year,
+                "aliases": sorted(names),
+                "ids": existing.get("ids", {}),
+            })
+
+    def get(self, tmdb_id) -> Optional[dict]:
+        if tmdb_id is None:
+            return None
+        return self.entries.get(str(tmdb_id))
+
+    def get_source_id(self, tmdb_id, source: str) -> Optional[str]:
+        entry = self.get(tmdb_id)
+        return entry["ids"].get(source) if entry else None
+
+    def set_source_id(self, tmdb_id, source: str, value: str) -> None:
+        with self._lock:
+            entry = self.get(tmdb_id)
+            if entry is not None and value:
+                entry["ids"][source] = value
+
+    def clear_source_id(self, tmdb_id, source: str) -> None:
+        with self._lock:
+            entry = self.get(tmdb_id)
+            if entry is not None:
+                entry["ids"].pop(source, None)
+
+    def candidate_titles(self, title: str, tmdb_id=None) -> List[str]:
+        """
+        Return `title` followed by the indexed title and aliases of `tmdb_id`,
+        skipping names that normalize to one already listed. Sources try these
+        in order when a lookup by the query title misses.
+        """
+        names = [title]
+        entry = self.get(tmdb_id)
+        if entry is not None:
+            names += [entry["title"], *entry["aliases"]]
+        seen = set()
+        candidates = []
+        for name in names:
+            key = normalize_title(name)
+            if key and key not in seen:
+                seen.add(key)
+                candidates.append(name)
+        return candidates
+
+    def match(self, title: str, year: Optional[int] = None, threshold: float = DEFAULT_MATCH_THRESHOLD, limit: int = 5) -> List[Tuple[str, float]]:
+        """
+        Return up to `limit` (tmdb_id, score) candidates whose title or alias has a
+        trigram Jaccard similarity of at least `threshold`, best first. When `year`
+        is given, candidates more than YEAR_TOLERANCE years away are dropped.
+        """
+        if not normalize_title(title):
+            return []
+        query = trigrams(title)
+        with self._lock:
+            hits: Dict[str, int] = defaultdict(int)
+            for gram in query:
+                for name_key in self._grams.get(gram, ()):
+                    hits[name_key] += 1
+            best: Dict[str, float] = {}
+            for name_key, shared in hits.items():
+                tmdb_id, name = name_key.split("|", 1)
+                entry = self.entries[tmdb_id]
+                if year is not None and entry["year"] is not None and not years_match(year, entry["year"]):
+                    continue
+                score = shared / len(query | trigrams(name))
+                if score >= threshold and score > best.get(tmdb_id, 0.0):
+                    best[tmdb_id] = score
+        return sorted(best.items(), key=lambda kv: kv[1], reverse=True)[:limit]
+
+    def resolve(self, title: str, year: Optional[int] = None) -> Optional[str]:
+        """
+        Return the tmdb_id of the best candidate for `title`/`year` whose normalized
+        title or alias equals the normalized query, so punctuation, accents and
+        off-by-one years still resolve but near misses ("The Crowd") do not.
+        """
+        wanted = normalize_title(title)
+        for tmdb_id, _ in self.match(title, year):
+            entry = self.entries[tmdb_id]
+            if any(normalize_title(name) == wanted for name in (entry["title"], *entry["aliases"])):
+                return tmdb_id
+        return None
+
+    def _insert(self, key: str, entry: dict) -> None:
+        old = self.entries.get(key)
+        if old is not None:
+            for name in (old["title"], *old["aliases"]):
+                for gram in trigrams(name):
+                    self._grams[gram].discard(f"{key}|{name}")
+        entry.setdefault("aliases", [])
+        entry.setdefault("ids", {})
+        self.entries[key] = entry
+        for name in (entry["title"], *entry["aliases"]):
+            for gram in trigrams(name):
+                self._grams[gram].add(f"{key}|{name}")
+
+    def __len__(self) -> int:
+        return len(self.entries)
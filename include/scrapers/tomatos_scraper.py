@@ -2,8 +2,8 @@
 
 from bs4 import BeautifulSoup, Tag
 from urllib.parse import urljoin
-from .base_scraper import BaseScraper
 from .base_scraper import logger, SeleniumScraper
+from .title_index import TitleIndex, years_match
 from typing import Optional, Dict
 import re
 
@@ -13,25 +13,22 @@ class RottenTomatoesScraper(SeleniumScraper):
     """
     Scraper for Rotten Tomatoes TV series ratings.
     """
-    def __init__(self):
-        super().__init__(base_url="https://www.rottentomatoes.com/")
+    BASE_URL = "https://www.rottentomatoes.com/"
+    SOURCE = "rotten_tomatoes"
+
+    def __init__(self, index: Optional[TitleIndex] = None):
+        super().__init__(base_url=self.BASE_URL, index=index)
 
     
-    def get_ratings(self, series_title: str, year: int) -> Optional[Dict[str, int | float | None]]:
+    def get_ratings(self, series_title: str, year: int, tmdb_id: Optional[int] = None) -> Optional[Dict[str, int | float | None]]:
         """
-        Fetch and parse ratings for a given series and year. Retries with _{year} suffix if not found or year mismatch.
+        Fetch and parse ratings for a given series and year. Tries the slug known from the title index first,
+        then retries with _{year} suffix if not found or year mismatch.
         """
-        sep = '_'
         if not series_title:
             logger.error("Series title cannot be empty.")
             return None
-        formatted_title = BaseScraper._preprocess_title(series_title, sep=sep)
-        result = self._fetch_and_validate(formatted_title, year)
-        if result:
-            return result
-        logger.info(f"Retrying with title: {formatted_title}{sep}{year}")
-        retry_title = f"{formatted_title}{sep}{year}"
-        return self._fetch_and_validate(retry_title, year)
+        return self._get_ratings_by_slug(series_title, year, sep='_', tmdb_id=tmdb_id)
 
     def _fetch_and_validate(self, formatted_title: str, year: int) -> Optional[Dict[str, int | float | None]]:
         url = urljoin(self.base_url, f"tv/{formatted_title}/")
@@ -40,7 +37,7 @@ class RottenTomatoesScraper(SeleniumScraper):
             return None
         ratings = self._parse_content(html_content)
         scraped_year = ratings.get("year")
-        if scraped_year == year:
+        if years_match(year, scraped_year):
             return ratings
         if scraped_year is not None:
             logger.warning(f"Year mismatch for {formatted_title}: expected {year}, found {scraped_year}.")
@@ -0,0 +1,91 @@
+"""Shared fixtures for include/ tests: a local HTTP server with canned routes."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from include.scrapers import base_scraper
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # Keep-alive, so fetchers reuse pooled connections as against real sites
+    protocol_version = "HTTP/1.1"
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, body=b"", length=True, content_type="text/html; charset=utf-8"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        if length:
+            self.send_header("Content-Length", str(len(body)))
+        else:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _drip(self, total, length):
+        self.send_response(200)
+        if length:
+            self.send_header("Content-Length", str(total))
+        else:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        try:
+            for _ in range(total):
+                self.wfile.write(b"x")
+                self.wfile.flush()
+                time.sleep(0.05)
+        except OSError:
+            pass
+
+    def _drip_headers(self, count):
+        try:
+            self.wfile.write(b"HTTP/1.1 200 OK\r\n")
+            for i in range(count):
+                self.wfile.write(f"X-Drip-{i}: x\r\n".encode())
+                self.wfile.flush()
+                time.sleep(0.1)
+            self.wfile.write(b"Content-Length: 0\r\n\r\n")
+        except OSError:
+            pass
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        if path == "/ok":
+            self._send(200, "héllo".encode("utf-8"))
+        elif path == "/json":
+            self._send(200, json.dumps({"Response": "True", "Title": "Game of Thrones"}).encode(), content_type="application/json")
+        elif path == "/big":
+            self._send(200, b"x" * 10_000)
+        elif path == "/big-unsized":
+            self._send(200, b"x" * 10_000, length=False)
+        elif path == "/slow":
+            self._drip(200, length=True)
+        elif path == "/slow-unsized":
+            self._drip(200, length=False)
+        elif path == "/slow-headers":
+            self._drip_headers(40)
+        elif path == "/not-json":
+            self._send(200, b"<html>maintenance</html>")
+        elif path == "/missing":
+            self._send(404, b"not found")
+        else:
+            self._send(500, b"error")
+
+
+@pytest.fixture
+def http_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    base_scraper._circuit_breakers.clear()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        base_scraper._circuit_breakers.clear()
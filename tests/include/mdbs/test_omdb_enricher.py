@@ -0,0 +1,68 @@
+"""Tests for OMDb enrichment error handling."""
+
+from include.mdbs.omdb_enricher import OMDbEnricher
+from include.scrapers.base_scraper import get_circuit_breaker
+from include.scrapers.title_index import TitleIndex
+
+
+def test_fetch_ratings_returns_none_on_server_error_and_open_circuit(http_server):
+    enricher = OMDbEnricher(api_key="test")
+    enricher.BASE_URL = f"{http_server}/error"
+    breaker = get_circuit_breaker(http_server.split("//", 1)[1])
+    for _ in range(breaker.failure_threshold + 2):
+        assert enricher.fetch_ratings("Game of Thrones", 2011) is None
+    assert breaker.state == breaker.OPEN
+
+
+def test_fetch_ratings_returns_none_on_non_json_body(http_server):
+    enricher = OMDbEnricher(api_key="test")
+    enricher.BASE_URL = f"{http_server}/not-json"
+    assert enricher.fetch_ratings("Game of Thrones", 2011) is None
+
+
+def _fake_omdb(responses, calls):
+    def _query(params):
+        calls.append(params)
+        key = params.get("i") or (params.get("t"), params.get("y"))
+        return responses.get(key)
+    return _query
+
+
+def test_title_lookup_falls_back_to_indexed_aliases(tmp_path):
+    index = TitleIndex(str(tmp_path / "title_index.json"))
+    index.add(71446, "Money Heist", 2017, aliases=["La casa de papel"])
+    enricher = OMDbEnricher(api_key="test", index=index)
+    calls = []
+    enricher._query = _fake_omdb({
+        ("La casa de papel", "2017"): {"imdbID": "tt6468322", "Year": "2017–2021", "imdbRating": "8.2"},
+    }, calls)
+    ratings = enricher.fetch_ratings("Money Heist", 2017, tmdb_id=71446)
+    assert ratings["imdb_rating"] == "8.2"
+    assert [c.get("t") for c in calls] == ["Money Heist", "Money Heist", "La casa de papel"]
+    assert index.get_source_id(71446, "imdb") == "tt6468322"
+
+
+def test_stored_imdb_id_with_mismatched_year_is_dropped(tmp_path):
+    index = TitleIndex(str(tmp_path / "title_index.json"))
+    index.add(1399, "Game of Thrones", 2011)
+    index.set_source_id(1399, "imdb", "tt-wrong")
+    enricher = OMDbEnricher(api_key="test", index=index)
+    calls = []
+    enricher._query = _fake_omdb({
+        "tt-wrong": {"imdbID": "tt-wrong", "Year": "2019–", "imdbRating": "5.0"},
+        ("Game of Thrones", "2011"): {"imdbID": "tt0944947", "Year": "2011–2019", "imdbRating": "9.2"},
+    }, calls)
+    ratings = enricher.fetch_ratings("Game of Thrones", 2011, tmdb_id=1399)
+    assert ratings["imdb_rating"] == "9.2"
+    assert index.get_source_id(1399, "imdb") == "tt0944947"
+
+
+def test_stored_imdb_id_is_used_when_year_matches(tmp_path):
+    index = TitleIndex(str(tmp_path / "title_index.json"))
+    index.add(1399, "Game of Thrones", 2011)
+    index.set_source_id(1399, "imdb", "tt0944947")
+    enricher = OMDbEnricher(api_key="test", index=index)
+    calls = []
+    enricher._query = _fake_omdb({"tt0944947": {"imdbID": "tt0944947", "Year": "2012–2019", "imdbRating": "9.2"}}, calls)
+    assert enricher.fetch_ratings("Game of Thrones", 2011, tmdb_id=1399)["imdb_rating"] == "9.2"
+    assert calls == [{"i": "tt0944947"}]
@@ -0,0 +1,111 @@
+"""Tests for the guarded fetch layer and circuit breaker in base_scraper."""
+
+import time
+import pytest
+import requests
+from include.scrapers.base_scraper import (
+    CircuitBreaker,
+    CircuitOpenError,
+    DeadlineExceeded,
+    HttpFetcher,
+    ResponseTooLarge,
+    get_circuit_breaker,
+)
+
+
+def test_breaker_opens_after_threshold():
+    breaker = CircuitBreaker("test", failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.record_failure()
+        assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+
+def test_breaker_success_resets_failure_count():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=60)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_breaker_half_open_admits_single_trial():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    assert not breaker.allow()
+
+
+def test_breaker_half_open_failure_reopens_and_success_closes():
+    breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_fetcher_reads_text_and_json(http_server):
+    fetcher = HttpFetcher()
+    assert fetcher.get_text(f"{http_server}/ok") == "héllo"
+    assert fetcher.get_json(f"{http_server}/json")["Title"] == "Game of Thrones"
+
+
+@pytest.mark.parametrize("path", ["/big", "/big-unsized"])
+def test_fetcher_caps_response_size(http_server, path):
+    with pytest.raises(ResponseTooLarge):
+        HttpFetcher(max_bytes=1024).get_text(f"{http_server}{path}")
+
+
+@pytest.mark.parametrize("path", ["/slow", "/slow-unsized", "/slow-headers"])
+def test_fetcher_deadline_bounds_slow_bodies(http_server, path):
+    # Each byte/header arrives well within the read timeout; only the deadline can stop it
+    fetcher = HttpFetcher(read_timeout=5, deadline=0.5)
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        fetcher.get_text(f"{http_server}{path}")
+    assert time.monotonic() - start < 2
+
+
+def test_fetcher_opens_circuit_on_server_errors(http_server):
+    fetcher = HttpFetcher()
+    breaker = get_circuit_breaker(http_server.split("//", 1)[1])
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(requests.exceptions.HTTPError):
+            fetcher.get_text(f"{http_server}/error")
+    with pytest.raises(CircuitOpenError):
+        fetcher.get_text(f"{http_server}/ok")
+
+
+def test_fetcher_client_errors_do_not_trip_circuit(http_server):
+    fetcher = HttpFetcher()
+    breaker = get_circuit_breaker(http_server.split("//", 1)[1])
+    for _ in range(breaker.failure_threshold + 1):
+        with pytest.raises(requests.exceptions.HTTPError):
+            fetcher.get_text(f"{http_server}/missing")
+    assert fetcher.get_text(f"{http_server}/ok") == "héllo"
+
+
+def test_fetcher_deadline_survives_connection_reuse(http_server):
+    fetcher = HttpFetcher(read_timeout=5, deadline=0.5)
+    assert fetcher.get_text(f"{http_server}/ok") == "héllo"
+    with pytest.raises(DeadlineExceeded):
+        fetcher.get_text(f"{http_server}/slow-headers")
+    assert fetcher.get_text(f"{http_server}/ok") == "héllo"
+
+
+def test_get_json_raises_request_exception_on_invalid_body(http_server):
+    with pytest.raises(requests.exceptions.InvalidJSONError):
+        HttpFetcher().get_json(f"{http_server}/not-json")
@@ -0,0 +1,130 @@
+"""Tests for the scraper CLI helpers in include/scrapers/main.py."""
+
+import pytest
+from include.scrapers import main
+from include.scrapers.main import SavedPages, build_scrapers, load_series, parse_args, run_profiled
+
+METACRITIC_PAGE = """
+<html><body>
+<div data-testid="hero-metadata"><ul><li><span>2011</span></li></ul></div>
+<div data-testid="critic-score-info">
+  <div class="c-siteReviewScore"><span>89</span></div>
+  <a data-testid="critic-path">Based on 28 Critic Reviews</a>
+</div>
+</body></html>
+"""
+
+
+def test_load_series_skips_header_comments_and_bad_rows(tmp_path):
+    path = tmp_path / "series.csv"
+    path.write_text(
+        "title,year\n"
+        "# a comment\n"
+        "Game of Thrones,2011\n"
+        "\n"
+        '"Love, Death & Robots",2019\n'
+        "Love, Death & Robots,2019\n"
+        "No Year,soon\n"
+        ",2020\n",
+        encoding="utf-8",
+    )
+    assert load_series(str(path)) == [
+        ("Game of Thrones", 2011),
+        ("Love, Death & Robots", 2019),
+        ("Love, Death & Robots", 2019),
+    ]
+
+
+def test_load_series_without_header(tmp_path):
+    path = tmp_path / "series.csv"
+    path.write_text("The Boys,2019\n", encoding="utf-8")
+    assert load_series(str(path)) == [("The Boys", 2019)]
+
+
+def test_saved_pages_path_for(tmp_path):
+    pages = SavedPages(str(tmp_path), "metacritic")
+    assert pages.path_for("https://www.metacritic.com/tv/game-of-thrones") == str(tmp_path / "metacritic" / "tv__game-of-thrones.html")
+    assert pages.path_for("https://www.rottentomatoes.com/tv/the_boys/") == str(tmp_path / "metacritic" / "tv__the_boys.html")
+    assert pages.path_for("https://www.metacritic.com/") == str(tmp_path / "metacritic" / "index.html")
+
+
+def test_saved_pages_round_trip(tmp_path):
+    pages = SavedPages(str(tmp_path), "metacritic")
+    url = "https://www.metacritic.com/tv/the-boys"
+    assert pages.load(url) is None
+    pages.save(url, "<html></html>")
+    assert pages.load(url) == "<html></html>"
+
+
+def test_replay_scraper_is_fully_constructed_offline(tmp_path):
+    SavedPages(str(tmp_path), "metacritic").save("https://www.metacritic.com/tv/game-of-thrones", METACRITIC_PAGE)
+    scraper, = build_scrapers("metacritic", 1, replay_dir=str(tmp_path))
+    assert scraper.fetcher is not None and scraper.session is scraper.fetcher.session
+    assert scraper.user_agent and scraper.robot_parser.allow_all
+    ratings = scraper.get_ratings("Game of Thrones", 2011)
+    assert ratings["critic_score"] == 89.0
+    assert ratings["critic_count"] == 28
+
+
+def test_replay_selenium_scraper_needs_no_browser(tmp_path, monkeypatch):
+    monkeypatch.setenv("CHROME_DRIVER", str(tmp_path / "missing-chromedriver"))
+    scraper, = build_scrapers("rotten_tomatoes", 1, replay_dir=str(tmp_path))
+    assert scraper.driver is None
+    assert scraper.get_ratings("The Boys", 2019) is None
+    scraper.quit()
+
+
+def test_build_scrapers_quits_started_scrapers_when_one_fails(monkeypatch):
+    started = []
+
+    class FlakyScraper:
+        def __init__(self, index=None):
+            if len(started) == 2:
+                raise RuntimeError("chromedriver failed to start")
+            self.quit_called = False
+            started.append(self)
+
+        def quit(self):
+            self.quit_called = True
+
+    monkeypatch.setitem(main.SCRAPERS, "flaky", FlakyScraper)
+    with pytest.raises(RuntimeError):
+        build_scrapers("flaky", 3)
+    assert len(started) == 2
+    assert all(scraper.quit_called for scraper in started)
+
+
+def test_parse_args_rejects_unknown_sort_key():
+    with pytest.raises(SystemExit):
+        parse_args(["--profile", "--sort", "bogus"])
+    assert parse_args(["--sort", "tottime"]).sort == "tottime"
+
+
+def test_run_profiled_checks_sort_key_before_running(tmp_path):
+    ran = []
+    with pytest.raises(ValueError):
+        run_profiled(lambda: ran.append(1), str(tmp_path), sort="bogus")
+    assert not ran
+
+
+@pytest.mark.parametrize("extra", [
+    ["--input", "series.csv"],
+    ["--source", "metacritic"],
+    ["--profile"],
+    ["--concurrency", "2"],
+    ["--replay-dir", "pages"],
+])
+def test_parse_args_rejects_stream_with_scraper_options(extra):
+    with pytest.raises(SystemExit):
+        parse_args(["--stream", *extra])
+    assert parse_args(["--stream"]).stream
+
+
+def test_replay_resolves_untagged_title_through_index_alias(tmp_path):
+    from include.scrapers.title_index import TitleIndex
+    index = TitleIndex(str(tmp_path / "title_index.json"))
+    index.add(1399, "Game of Thrones", 2011, aliases=["Le Trône de fer"])
+    SavedPages(str(tmp_path), "metacritic").save("https://www.metacritic.com/tv/le-trone-de-fer", METACRITIC_PAGE)
+    scraper, = build_scrapers("metacritic", 1, replay_dir=str(tmp_path), index=index)
+    assert scraper.get_ratings("game of thrones!", 2012)["critic_score"] == 89.0
+    assert index.get_source_id(1399, "metacritic") == "le-trone-de-fer"
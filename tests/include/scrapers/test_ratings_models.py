@@ -0,0 +1,31 @@
+"""Tests for ratings validation helpers."""
+
+from include.scrapers.ratings_models import validate_series_ratings
+
+
+def test_validate_series_ratings_coerces_present_sources():
+    series = {
+        'title': 'The Boys',
+        'year': 2019,
+        'omdb_ratings': {'critic_score': '8.7', 'user_count': '1200'},
+        'metacritic_ratings': {'critic_score': 74.0, 'year': 2019},
+    }
+    validated = validate_series_ratings(series)
+    assert validated['omdb_ratings']['critic_score'] == 8.7
+    assert validated['omdb_ratings']['user_count'] == 1200
+    assert validated['omdb_ratings']['title'] == 'The Boys'
+    assert validated['metacritic_ratings']['year'] == 2019
+
+
+def test_validate_series_ratings_leaves_missing_and_empty_sources():
+    series = {'title': 'The Boys', 'year': 2019, 'rotten_tomatoes_ratings': {}}
+    validated = validate_series_ratings(series)
+    assert validated['rotten_tomatoes_ratings'] == {}
+    assert 'omdb_ratings' not in validated
+
+
+def test_validate_series_ratings_keeps_raw_dict_on_invalid_year():
+    raw = {'critic_score': 50.0, 'year': 1800}
+    validated = validate_series_ratings({'title': 'Old', 'year': 1800, 'metacritic_ratings': raw})
+    assert validated['metacritic_ratings']['year'] == 1800
+    assert 'critic_count' not in validated['metacritic_ratings']
@@ -0,0 +1,101 @@
+"""Tests for the title-matching index."""
+
+from include.scrapers.title_index import TitleIndex, normalize_title, trigrams, years_match
+
+
+def make_index(tmp_path):
+    index = TitleIndex(str(tmp_path / "title_index.json"))
+    index.add(1399, "Game of Thrones", 2011)
+    index.add(65494, "The Crown", 2016)
+    index.add(19885, "Sherlock", 2010)
+    index.add(94605, "Arcane", 2021, aliases=["Arcane: League of Legends"])
+    return index
+
+
+def test_normalize_title_strips_punctuation_and_accents():
+    assert normalize_title("  Pokémon: The Series!! ") == "pokemon the series"
+    assert normalize_title("Law & Order") == "law and order"
+    assert normalize_title("Marvel's Agents of S.H.I.E.L.D.") == "marvel s agents of s h i e l d"
+
+
+def test_empty_title_has_no_matches(tmp_path):
+    index = make_index(tmp_path)
+    assert index.match("") == []
+    assert index.match("?!") == []
+    assert index.resolve("") is None
+
+
+def test_year_tolerance(tmp_path):
+    index = make_index(tmp_path)
+    assert years_match(2011, 2012)
+    assert not years_match(2011, 2013)
+    assert not years_match(2011, None)
+    assert index.resolve("Game of Thrones", 2012) == "1399"
+    assert index.resolve("Game of Thrones", 2010) == "1399"
+    assert index.resolve("Game of Thrones", 2013) is None
+
+
+def test_resolve_tolerates_punctuation_and_aliases(tmp_path):
+    index = make_index(tmp_path)
+    assert index.resolve("game of thrones!", 2011) == "1399"
+    assert index.resolve("Arcane - League of Legends", 2021) == "94605"
+
+
+def test_near_miss_titles_do_not_resolve(tmp_path):
+    index = make_index(tmp_path)
+    assert index.match("The Crowd", 2016)  # still a fuzzy candidate
+    assert index.resolve("The Crowd", 2016) is None
+    assert index.resolve("Sherlock Holmes", 2010) is None
+
+
+def test_re_add_replaces_aliases_and_reindexes(tmp_path):
+    index = make_index(tmp_path)
+    index.add(94605, "Arcane", 2021, aliases=["Arcane: Bridging the Rift"])
+    assert index.get(94605)["aliases"] == ["Arcane: Bridging the Rift"]
+    assert index.resolve("Arcane: League of Legends", 2021) is None
+    assert index.resolve("Arcane: Bridging the Rift", 2021) == "94605"
+    assert not any("94605|Arcane: League of Legends" in keys for keys in index._grams.values())
+
+
+def test_ids_survive_re_add(tmp_path):
+    index = make_index(tmp_path)
+    index.set_source_id(1399, "imdb", "tt0944947")
+    index.add(1399, "Game of Thrones", 2011, aliases=["GoT"])
+    assert index.get_source_id(1399, "imdb") == "tt0944947"
+
+
+def test_save_load_round_trip(tmp_path):
+    index = make_index(tmp_path)
+    index.set_source_id(1399, "metacritic", "game-of-thrones")
+    index.save()
+    loaded = TitleIndex.load(index.path)
+    assert len(loaded) == len(index)
+    assert loaded.get(1399) == index.get(1399)
+    assert loaded.get_source_id("1399", "metacritic") == "game-of-thrones"
+    assert loaded.resolve("Arcane: League of Legends", 2021) == "94605"
+
+
+def test_load_missing_or_corrupt_file_starts_empty(tmp_path):
+    assert len(TitleIndex.load(str(tmp_path / "missing.json"))) == 0
+    corrupt = tmp_path / "corrupt.json"
+    corrupt.write_text("{not json")
+    assert len(TitleIndex.load(str(corrupt))) == 0
+
+
+def test_trigrams_are_padded():
+    assert trigrams("ab") == {"  a", " ab", "ab "}
+
+
+def test_candidate_titles_lists_query_then_indexed_names(tmp_path):
+    index = make_index(tmp_path)
+    assert index.candidate_titles("Arcane!", 94605) == ["Arcane!", "Arcane: League of Legends"]
+    assert index.candidate_titles("Arcane", None) == ["Arcane"]
+    assert index.candidate_titles("Arcane", 404) == ["Arcane"]
+
+
+def test_clear_source_id(tmp_path):
+    index = make_index(tmp_path)
+    index.set_source_id(1399, "imdb", "tt0944947")
+    index.clear_source_id(1399, "imdb")
+    assert index.get_source_id(1399, "imdb") is None
+    index.clear_source_id(404, "imdb")
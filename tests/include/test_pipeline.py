@@ -0,0 +1,147 @@
+"""Tests for the bounded streaming stages in include/pipeline.py."""
+
+import threading
+import time
+import pytest
+from include.pipeline import buffered, clean_and_validate
+
+
+def test_buffered_yields_all_items_in_order():
+    assert list(buffered(iter(range(100)), maxsize=4)) == list(range(100))
+
+
+def test_buffered_applies_backpressure():
+    produced = []
+
+    def source():
+        for i in range(10):
+            produced.append(i)
+            yield i
+
+    stream = buffered(source(), maxsize=2)
+    assert next(stream) == 0
+    time.sleep(0.2)
+    # One item consumed, at most `maxsize` queued and one blocked in put()
+    assert len(produced) <= 4
+    stream.close()
+
+
+def test_buffered_reraises_producer_error_after_items():
+    def source():
+        yield 1
+        yield 2
+        raise RuntimeError("boom")
+
+    stream = buffered(source(), maxsize=4)
+    assert next(stream) == 1
+    assert next(stream) == 2
+    with pytest.raises(RuntimeError, match="boom"):
+        next(stream)
+
+
+def test_buffered_early_close_stops_producer_and_closes_source():
+    closed = threading.Event()
+
+    def source():
+        try:
+            i = 0
+            while True:
+                yield i
+                i += 1
+        finally:
+            closed.set()
+
+    before = {t.name for t in threading.enumerate()}
+    stream = buffered(source(), maxsize=2, name="early-close")
+    assert next(stream) == 0
+    stream.close()
+    assert closed.wait(timeout=2)
+    assert "pipeline-early-close" not in {t.name for t in threading.enumerate()} - before
+
+
+def test_chained_buffered_stages():
+    stream = buffered((i * 2 for i in range(20)), maxsize=3, name="double")
+    stream = buffered((i + 1 for i in stream), maxsize=3, name="increment")
+    assert list(stream) == [i * 2 + 1 for i in range(20)]
+
+
+def test_clean_and_validate_validates_each_source():
+    series = [{
+        'title': 'Game of Thrones',
+        'year': 2011,
+        'metacritic_ratings': {'critic_score': '89', 'critic_count': 10, 'year': 2011},
+        'rotten_tomatoes_ratings': None,
+    }]
+    cleaned = list(clean_and_validate(series))
+    assert cleaned[0]['metacritic_ratings']['critic_score'] == 89.0
+    assert cleaned[0]['rotten_tomatoes_ratings'] is None
+
+
+class _FakeScraper:
+    def __init__(self, index=None):
+        self.quit_called = False
+        self.calls_after_quit = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.quit_called = True
+
+    def get_ratings(self, title, year, tmdb_id=None):
+        if self.quit_called:
+            self.calls_after_quit += 1
+        return None
+
+
+class _FailingSink:
+    def __init__(self):
+        self.loaded = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    def write(self, s):
+        raise RuntimeError("db down")
+
+
+def test_run_pipeline_streaming_stops_producers_when_sink_fails(monkeypatch, tmp_path):
+    from include import pipeline
+
+    class FakeTMDB:
+        def iter_top_rated_series(self, max_pages=None):
+            i = 0
+            while True:
+                yield {'title': f'Series {i}', 'year': 2020, 'tmdb_id': i}
+                i += 1
+
+    class FakeOMDb:
+        def __init__(self, index=None):
+            pass
+
+        def fetch_ratings(self, title, year=None, tmdb_id=None):
+            return None
+
+    scrapers = []
+
+    def make_scraper(index=None):
+        scrapers.append(_FakeScraper())
+        return scrapers[-1]
+
+    monkeypatch.setenv("TITLE_INDEX_PATH", str(tmp_path / "title_index.json"))
+    monkeypatch.setattr(pipeline, "TMDBIngestor", FakeTMDB)
+    monkeypatch.setattr(pipeline, "OMDbEnricher", FakeOMDb)
+    monkeypatch.setattr(pipeline, "MetacriticScraper", make_scraper)
+    monkeypatch.setattr(pipeline, "RottenTomatoesScraper", make_scraper)
+
+    with pytest.raises(RuntimeError, match="db down"):
+        pipeline.run_pipeline_streaming(max_pages=None, buffer_size=2, sink_factory=_FailingSink)
+
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline and any(t.name.startswith("pipeline-") for t in threading.enumerate()):
+        time.sleep(0.05)
+    assert not [t.name for t in threading.enumerate() if t.name.startswith("pipeline-")]
+    assert all(s.calls_after_quit == 0 for s in scrapers)